@@ -0,0 +1,69 @@
+//! Chunk scan kernels: tiled `VectorBlocks` vs row-at-a-time scoring
+//!
+//! Run with `cargo bench --bench scan`. Each group scores one query against
+//! `n` 384-dim chunks - 20 is one demo document, 4096 spills out of L2 -
+//! and compares:
+//!
+//! - `tiles`: `VectorBlocks::cosines` (dimension-major tiles, 16 lanes)
+//! - `int8`: `VectorBlocks::cosines` over int8 rows; the query is prepared
+//!   once, as a search does for every document it scans
+//! - `rows`: `dot_f32` over contiguous row-major vectors
+//! - `per_child`: `Cosine384::proximity` per chunk `Point`, as the tree
+//!   scores children without tiles
+
+use arms_hat::adapters::index::{Quantization, ScanQuery, VectorBlocks};
+use arms_hat::core::proximity::{Cosine384, Proximity};
+use arms_hat::core::simd::dot_f32;
+use arms_hat::{Id, Point};
+use criterion::{black_box, criterion_group, criterion_main, BenchmarkId, Criterion};
+
+const DIMS: usize = 384;
+
+fn vectors(n: usize) -> Vec<Vec<f32>> {
+    (0..n)
+        .map(|i| (0..DIMS).map(|d| ((i * DIMS + d) as f32 * 0.618).sin()).collect())
+        .collect()
+}
+
+fn bench_scan(c: &mut Criterion) {
+    let query: Vec<f32> = (0..DIMS).map(|d| (d as f32 * 0.29).cos()).collect();
+    let scan_query = ScanQuery::new(&query);
+    let query_point = Point::new(query.clone());
+
+    let mut group = c.benchmark_group("scan_384");
+    for n in [20, 256, 1024, 4096] {
+        let rows = vectors(n);
+
+        for (name, quantization) in [("tiles", Quantization::F32), ("int8", Quantization::Int8)] {
+            let mut blocks = VectorBlocks::with_quantization(DIMS, 16, quantization);
+            for row in &rows {
+                blocks.push(Id::now(), row);
+            }
+            group.bench_with_input(BenchmarkId::new(name, n), &blocks, |b, blocks| {
+                b.iter(|| blocks.cosines(black_box(&scan_query)))
+            });
+        }
+
+        let flat: Vec<f32> = rows.iter().flatten().copied().collect();
+        group.bench_with_input(BenchmarkId::new("rows", n), &flat, |b, flat| {
+            b.iter(|| {
+                flat.chunks_exact(DIMS)
+                    .map(|row| dot_f32(black_box(&query), row))
+                    .collect::<Vec<f32>>()
+            })
+        });
+
+        let points: Vec<Point> = rows.into_iter().map(Point::new).collect();
+        group.bench_with_input(BenchmarkId::new("per_child", n), &points, |b, points| {
+            b.iter(|| {
+                points.iter()
+                    .map(|p| Cosine384.proximity(black_box(&query_point), p))
+                    .collect::<Vec<f32>>()
+            })
+        });
+    }
+    group.finish();
+}
+
+criterion_group!(benches, bench_scan);
+criterion_main!(benches);
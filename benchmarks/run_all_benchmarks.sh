@@ -92,7 +92,7 @@ echo "Building release version..."
 cargo build --release 2>&1 | tail -5
 
 echo "Building test suite..."
-cargo build --tests 2>&1 | tail -5
+cargo build --tests --features mmap 2>&1 | tail -5
 
 echo ""
 echo "========================================================================"
@@ -114,6 +114,17 @@ echo ""
 echo "--- Phase 3.3: Persistence Layer ---"
 run_benchmark "Persistence" "phase33_persistence"
 
+# Memory-mapped loading is behind the "mmap" feature, off by default
+echo -e "${BLUE}[Memory-Mapped Load]${NC} Running..."
+echo "" >> "$RESULTS_FILE"
+echo "=== Memory-Mapped Load ===" >> "$RESULTS_FILE"
+if cargo test --lib --features mmap load_mmap 2>&1 | tee -a "$RESULTS_FILE"; then
+    echo -e "${GREEN}[Memory-Mapped Load]${NC} PASSED"
+else
+    echo -e "${RED}[Memory-Mapped Load]${NC} FAILED"
+    echo "FAILED" >> "$RESULTS_FILE"
+fi
+
 # Phase 4.2: Attention State
 echo ""
 echo "--- Phase 4.2: Attention State Format ---"
@@ -3,17 +3,21 @@ ARMS-HAT: Hierarchical Attention Tree for AI memory retrieval.
 
 A semantic memory index optimized for LLM conversation history.
 
+Embeddings are passed as 1-D float32 numpy arrays; lists still work but
+are converted element by element and raise a DeprecationWarning.
+
 Example:
+    >>> import numpy as np
     >>> from arms_hat import HatIndex
     >>>
     >>> # Create index for OpenAI embeddings (1536 dims)
     >>> index = HatIndex.cosine(1536)
     >>>
     >>> # Add embeddings
-    >>> id1 = index.add([0.1] * 1536)
+    >>> id1 = index.add(np.full(1536, 0.1, dtype=np.float32))
     >>>
     >>> # Query
-    >>> results = index.near([0.1] * 1536, k=10)
+    >>> results = index.near(np.full(1536, 0.1, dtype=np.float32), k=10)
     >>> for r in results:
     ...     print(f"{r.id}: {r.score}")
     >>>
@@ -4,6 +4,15 @@ import pytest
 import tempfile
 import os
 
+import numpy as np
+
+
+def unit(i, dims):
+    """float32 one-hot vector along dimension i."""
+    embedding = np.zeros(dims, dtype=np.float32)
+    embedding[i] = 1.0
+    return embedding
+
 
 def test_import():
     """Test that the module can be imported."""
@@ -29,7 +38,7 @@ def test_add_and_query():
     # Add some points
     ids = []
     for i in range(10):
-        embedding = [0.0] * dims
+        embedding = np.zeros(dims, dtype=np.float32)
         embedding[i % dims] = 1.0
         embedding[(i + 1) % dims] = 0.5
         id_ = index.add(embedding)
@@ -40,7 +49,7 @@ def test_add_and_query():
     assert not index.is_empty()
 
     # Query
-    query = [0.0] * dims
+    query = np.zeros(dims, dtype=np.float32)
     query[0] = 1.0
     query[1] = 0.5
 
@@ -52,6 +61,115 @@ def test_add_and_query():
     assert results[0].score > 0.9  # High cosine similarity
 
 
+def test_near_batch():
+    """Test columnar search results."""
+    from arms_hat import HatIndex
+
+    dims = 32
+    index = HatIndex.cosine(dims)
+
+    for i in range(10):
+        index.add(unit(i, dims))
+
+    query = unit(2, dims)
+    ids, scores = index.near_batch(query, k=5)
+
+    assert isinstance(scores, np.ndarray)
+    assert scores.dtype == np.float32
+    assert len(ids) == len(scores) == 5
+
+    # Same hits, in the same order, as near()
+    results = index.near(query, k=5)
+    assert ids == [r.id for r in results]
+    assert np.allclose(scores, [r.score for r in results])
+
+
+def test_cosine_int8():
+    """Test the int8-quantized index."""
+    from arms_hat import HatIndex
+
+    dims = 64
+    index = HatIndex.cosine_int8(dims)
+
+    ids = []
+    for i in range(10):
+        embedding = np.zeros(dims, dtype=np.float32)
+        embedding[i % dims] = 1.0
+        embedding[(i + 1) % dims] = 0.5
+        ids.append(index.add(embedding))
+
+    query = np.zeros(dims, dtype=np.float32)
+    query[3] = 1.0
+    query[4] = 0.5
+
+    results = index.near(query, k=3)
+    assert results[0].id == ids[3]
+    assert abs(results[0].score - 1.0) < 0.01
+
+
+def test_add_numpy_array():
+    """Test adding float32 numpy arrays."""
+    from arms_hat import HatIndex
+
+    dims = 64
+    index = HatIndex.cosine(dims)
+
+    embedding = np.zeros(dims, dtype=np.float32)
+    embedding[0] = 1.0
+    id_ = index.add(embedding)
+    assert len(id_) == 32
+
+    # Non-contiguous views are accepted too
+    strided = np.zeros(dims * 2, dtype=np.float32)[::2]
+    strided[1] = 1.0
+    index.add(strided)
+
+    assert len(index) == 2
+    results = index.near(unit(0, dims), k=1)
+    assert results[0].id == id_
+
+
+def test_add_many():
+    """Test batch insertion from a float32 matrix."""
+    from arms_hat import HatIndex
+
+    dims = 64
+    index = HatIndex.cosine(dims)
+
+    embeddings = np.zeros((10, dims), dtype=np.float32)
+    for i in range(10):
+        embeddings[i, i] = 1.0
+        embeddings[i, i + 1] = 0.5
+
+    ids = index.add_many(embeddings)
+    assert len(ids) == 10
+    assert len(set(ids)) == 10
+    assert len(index) == 10
+
+    # Rows keep their order in the returned IDs
+    results = index.near(embeddings[3], k=1)
+    assert results[0].id == ids[3]
+
+    # Mismatched width is rejected
+    with pytest.raises(ValueError):
+        index.add_many(np.zeros((2, dims + 1), dtype=np.float32))
+
+
+def test_list_input_deprecated():
+    """Lists still work but warn; numpy arrays are the supported input."""
+    from arms_hat import HatIndex
+
+    index = HatIndex.cosine(4)
+
+    with pytest.warns(DeprecationWarning):
+        id_ = index.add([1.0, 0.0, 0.0, 0.0])
+
+    with pytest.warns(DeprecationWarning):
+        results = index.near([1.0, 0.0, 0.0, 0.0], k=1)
+
+    assert results[0].id == id_
+
+
 def test_sessions():
     """Test session management."""
     from arms_hat import HatIndex
@@ -60,14 +178,14 @@ def test_sessions():
 
     # Add points to first session
     for i in range(5):
-        index.add([float(i % 32 == j) for j in range(32)])
+        index.add(unit(i, 32))
 
     # Start new session
     index.new_session()
 
     # Add points to second session
     for i in range(5):
-        index.add([float((i + 10) % 32 == j) for j in range(32)])
+        index.add(unit((i + 10) % 32, 32))
 
     stats = index.stats()
     assert stats.session_count >= 1  # At least one session
@@ -82,14 +200,14 @@ def test_documents():
 
     # Add points to first document
     for i in range(3):
-        index.add([1.0 if j == i else 0.0 for j in range(32)])
+        index.add(unit(i, 32))
 
     # Start new document
     index.new_document()
 
     # Add points to second document
     for i in range(3):
-        index.add([1.0 if j == i + 10 else 0.0 for j in range(32)])
+        index.add(unit(i + 10, 32))
 
     stats = index.stats()
     assert stats.document_count >= 1
@@ -106,7 +224,7 @@ def test_persistence_bytes():
     # Add points
     ids = []
     for i in range(20):
-        embedding = [0.1] * dims
+        embedding = np.full(dims, 0.1, dtype=np.float32)
         embedding[i % dims] = 1.0
         ids.append(index.add(embedding))
 
@@ -119,7 +237,7 @@ def test_persistence_bytes():
     assert len(loaded) == len(index)
 
     # Query should give same results
-    query = [0.1] * dims
+    query = np.full(dims, 0.1, dtype=np.float32)
     query[0] = 1.0
 
     original_results = index.near(query, k=5)
@@ -138,7 +256,7 @@ def test_persistence_file():
 
     # Add points
     for i in range(10):
-        embedding = [0.1] * dims
+        embedding = np.full(dims, 0.1, dtype=np.float32)
         embedding[i % dims] = 1.0
         index.add(embedding)
 
@@ -167,6 +285,8 @@ def test_config():
     # Chain configuration
     config = config.with_beam_width(5)
     config = config.with_temporal_weight(0.1)
+    config = config.with_block_size(8)
+    assert "block_size=8" in repr(config)
 
     index = HatIndex.with_config(128, config)
     assert len(index) == 0
@@ -178,8 +298,8 @@ def test_remove():
 
     index = HatIndex.cosine(32)
 
-    id1 = index.add([1.0] + [0.0] * 31)
-    id2 = index.add([0.0, 1.0] + [0.0] * 30)
+    id1 = index.add(unit(0, 32))
+    id2 = index.add(unit(1, 32))
 
     assert len(index) == 2
 
@@ -187,7 +307,7 @@ def test_remove():
     assert len(index) == 1
 
     # Query should only find id2
-    results = index.near([0.0, 1.0] + [0.0] * 30, k=5)
+    results = index.near(unit(1, 32), k=5)
     assert len(results) == 1
     assert results[0].id == id2
 
@@ -200,7 +320,7 @@ def test_consolidate():
 
     # Add many points
     for i in range(100):
-        embedding = [0.0] * 32
+        embedding = np.zeros(32, dtype=np.float32)
         embedding[i % 32] = 1.0
         index.add(embedding)
 
@@ -218,7 +338,7 @@ def test_stats():
     index = HatIndex.cosine(64)
 
     for i in range(10):
-        index.add([float(i % 64 == j) for j in range(64)])
+        index.add(unit(i % 64, 64))
 
     stats = index.stats()
     assert stats.chunk_count == 10
@@ -246,7 +366,7 @@ def test_near_sessions():
 
     # Session 1: points along dimension 0
     for i in range(5):
-        embedding = [0.0] * 32
+        embedding = np.zeros(32, dtype=np.float32)
         embedding[0] = 1.0
         embedding[i + 1] = 0.3
         index.add(embedding)
@@ -255,13 +375,13 @@ def test_near_sessions():
 
     # Session 2: points along dimension 10
     for i in range(5):
-        embedding = [0.0] * 32
+        embedding = np.zeros(32, dtype=np.float32)
         embedding[10] = 1.0
         embedding[i + 11] = 0.3
         index.add(embedding)
 
     # Query similar to session 1
-    query = [0.0] * 32
+    query = np.zeros(32, dtype=np.float32)
     query[0] = 1.0
 
     sessions = index.near_sessions(query, k=2)
@@ -272,6 +392,63 @@ def test_near_sessions():
         assert sessions[0].score >= sessions[1].score
 
 
+def test_concurrent_near():
+    """Test queries issued from several threads at once."""
+    from concurrent.futures import ThreadPoolExecutor
+    from arms_hat import HatIndex
+
+    dims = 32
+    index = HatIndex.cosine(dims)
+
+    ids = []
+    for i in range(dims):
+        embedding = np.zeros(dims, dtype=np.float32)
+        embedding[i] = 1.0
+        ids.append(index.add(embedding))
+
+    def query(i):
+        embedding = np.zeros(dims, dtype=np.float32)
+        embedding[i % dims] = 1.0
+        return index.near(embedding, k=1)[0].id
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        found = list(executor.map(query, range(100)))
+
+    assert found == [ids[i % dims] for i in range(100)]
+
+
+def test_consolidate_in_background():
+    """Test consolidation on one thread while another inserts and searches."""
+    import threading
+    from arms_hat import HatIndex
+
+    dims = 32
+    index = HatIndex.cosine(dims)
+
+    for i in range(200):
+        if i % 20 == 0:
+            index.new_document()
+        index.add(unit(i % dims, dims))
+
+    rng = np.random.default_rng(7)
+    worker = threading.Thread(target=index.consolidate_full)
+    worker.start()
+
+    added = []
+    for i in range(50):
+        embedding = rng.standard_normal(dims).astype(np.float32)
+        added.append((index.add(embedding), embedding))
+        assert len(index.near(unit(i % dims, dims), k=1)) == 1
+
+    worker.join()
+    assert len(index) == 250
+
+    # Chunks inserted mid-consolidation are still attached and searchable;
+    # k covering the whole index makes the beam exhaustive
+    for hat_id, embedding in added:
+        assert index.near(embedding, k=len(index))[0].id == hat_id
+
+
 def test_high_dimensions():
     """Test with OpenAI embedding dimensions."""
     from arms_hat import HatIndex
@@ -281,13 +458,13 @@ def test_high_dimensions():
 
     # Add some high-dimensional points
     for i in range(10):
-        embedding = [(j * i * 0.01) % 1.0 for j in range(dims)]
+        embedding = (np.arange(dims, dtype=np.float32) * np.float32(i * 0.01)) % 1.0
         index.add(embedding)
 
     assert len(index) == 10
 
     # Query
-    query = [0.5] * dims
+    query = np.full(dims, 0.5, dtype=np.float32)
     results = index.near(query, k=5)
     assert len(results) == 5
 
@@ -18,6 +18,7 @@ use crate::core::proximity::Proximity;
 use crate::core::merge::Merge;
 use crate::ports::{Near, NearError, NearResult, SearchResult};
 
+use super::blocks::{Quantization, ScanQuery, VectorBlocks, DEFAULT_BLOCK_SIZE};
 use super::consolidation::{
     Consolidate, ConsolidationConfig, ConsolidationPhase, ConsolidationState,
     ConsolidationMetrics, ConsolidationProgress, ConsolidationTickResult,
@@ -78,6 +79,16 @@ pub struct HatConfig {
 
     /// Configuration for learnable routing
     pub learnable_routing_config: super::learnable_routing::LearnableRoutingConfig,
+
+    /// Lanes per AoSoA tile when storing chunk vectors for scanning
+    /// (default: 16 on x86_64, 8 on aarch64)
+    pub block_size: usize,
+
+    /// Element type of the scanned chunk vectors (default: F32). `Int8`
+    /// stores one byte per dimension plus a per-vector scale in addition
+    /// to the f32 chunk centroids, which consolidation and persistence
+    /// still use. Not stored by `to_bytes`, like the rest of the config.
+    pub quantization: Quantization,
 }
 
 impl Default for HatConfig {
@@ -95,6 +106,8 @@ impl Default for HatConfig {
             subspace_config: super::subspace::SubspaceConfig::default(),
             learnable_routing_enabled: false, // Default: disabled for backward compatibility
             learnable_routing_config: super::learnable_routing::LearnableRoutingConfig::default(),
+            block_size: DEFAULT_BLOCK_SIZE, // Match the target's SIMD width
+            quantization: Quantization::F32, // Default: exact scores
         }
     }
 }
@@ -150,6 +163,16 @@ impl HatConfig {
         self.learnable_routing_enabled = true;  // Automatically enable when config is provided
         self
     }
+
+    pub fn with_block_size(mut self, block_size: usize) -> Self {
+        self.block_size = block_size.max(1);
+        self
+    }
+
+    pub fn with_quantization(mut self, quantization: Quantization) -> Self {
+        self.quantization = quantization;
+        self
+    }
 }
 
 /// Level in the hierarchy
@@ -254,12 +277,9 @@ impl Container {
             .unwrap()
             .as_millis() as u64;
 
-        // For chunks, the accumulated sum is the point itself
-        let accumulated_sum = if level == ContainerLevel::Chunk {
-            Some(centroid.clone())
-        } else {
-            None
-        };
+        // Chunks never aggregate children, so they carry no accumulated sum;
+        // their point is the centroid (and lives in the document's tiles)
+        let accumulated_sum = None;
 
         // Initialize subspace for non-chunk containers
         let subspace = if level != ContainerLevel::Chunk {
@@ -322,22 +342,45 @@ pub struct HatIndex {
 
     /// Learnable router for adaptive routing weights
     learnable_router: Option<super::learnable_routing::LearnableRouter>,
+
+    /// Chunk vectors of each document in tiled (AoSoA) layout
+    chunk_blocks: HashMap<Id, VectorBlocks>,
+
+    /// Whether chunk scoring can use the tiled cosine scan
+    tiled_scan: bool,
 }
 
 impl HatIndex {
     /// Create a new HAT index with cosine similarity
+    ///
+    /// 384, 768 and 1536 dimensions use a fixed-width cosine kernel.
     pub fn cosine(dimensionality: usize) -> Self {
-        use crate::core::proximity::Cosine;
         use crate::core::merge::Mean;
         Self::new(
             dimensionality,
-            Arc::new(Cosine),
+            cosine_proximity(dimensionality),
             Arc::new(Mean),
             true,
             HatConfig::default(),
         )
     }
 
+    /// Create a cosine index that scans int8-quantized chunk vectors
+    ///
+    /// Document scans read a quarter of the bytes of f32 tiles. The int8
+    /// codes are kept next to the f32 centroids, so resident memory grows
+    /// by about a quarter rather than shrinking. `near` ranks chunks by
+    /// their int8 scores and then rescores the chunks it returns in f32,
+    /// so its scores are exact. `near_in_document` returns the int8
+    /// scores, which are typically within 0.01 of exact cosine.
+    ///
+    /// The quantization mode is not persisted; reloaded indexes use the
+    /// default (f32) config until `with_config` is applied again.
+    pub fn cosine_int8(dimensionality: usize) -> Self {
+        Self::cosine(dimensionality)
+            .with_config(HatConfig::new().with_quantization(Quantization::Int8))
+    }
+
     /// Create with custom config
     pub fn with_config(mut self, config: HatConfig) -> Self {
         // Initialize learnable router if enabled
@@ -347,7 +390,12 @@ impl HatIndex {
                 config.learnable_routing_config.clone(),
             ));
         }
+        let rebuild = config.block_size != self.config.block_size
+            || config.quantization != self.config.quantization;
         self.config = config;
+        if rebuild {
+            self.rebuild_all_blocks();
+        }
         self
     }
 
@@ -369,6 +417,9 @@ impl HatIndex {
             None
         };
 
+        // Tiles store raw vectors and norms, so the scan reproduces cosine only
+        let tiled_scan = higher_is_better && proximity.name() == "cosine";
+
         Self {
             containers: HashMap::new(),
             root_id: None,
@@ -382,6 +433,8 @@ impl HatIndex {
             consolidation_state: None,
             consolidation_points_cache: HashMap::new(),
             learnable_router,
+            chunk_blocks: HashMap::new(),
+            tiled_scan,
         }
     }
 
@@ -433,13 +486,82 @@ impl HatIndex {
             self.distance(query, &container.centroid)
         };
 
-        let temporal = self.temporal_distance(query_time, container.timestamp);
+        self.blend_temporal(semantic, query_time, container.timestamp)
+    }
+
+    /// Weighted combination of a semantic distance with temporal distance
+    fn blend_temporal(&self, semantic: f32, query_time: u64, timestamp: u64) -> f32 {
+        let temporal = self.temporal_distance(query_time, timestamp);
 
-        // Weighted combination
         let w = self.config.temporal_weight;
         semantic * (1.0 - w) + temporal * w
     }
 
+    /// Score every chunk of a document with one scan over its tiles
+    ///
+    /// Returns `None` when the tiled path does not apply (non-cosine
+    /// proximity, learnable routing, or no tiles for this container);
+    /// callers then fall back to per-child `combined_distance`.
+    fn tiled_chunk_distances(
+        &self,
+        doc_id: Id,
+        query: &ScanQuery<'_>,
+        query_time: u64,
+    ) -> Option<Vec<(Id, f32)>> {
+        if !self.tiled_scan || self.config.learnable_routing_enabled {
+            return None;
+        }
+
+        let blocks = self.chunk_blocks.get(&doc_id)?;
+        let sims = blocks.cosines(query);
+
+        Some(
+            blocks.ids()
+                .iter()
+                .zip(sims)
+                .filter_map(|(id, sim)| {
+                    // Removed chunks keep their lane until the next rebuild
+                    let chunk = self.containers.get(id)?;
+                    Some((*id, self.blend_temporal(1.0 - sim, query_time, chunk.timestamp)))
+                })
+                .collect(),
+        )
+    }
+
+    /// Rebuild the tiles of a document from its current children
+    fn rebuild_blocks(&mut self, container_id: Id) {
+        let container = match self.containers.get(&container_id) {
+            Some(c) if c.level == ContainerLevel::Document => c,
+            _ => {
+                self.chunk_blocks.remove(&container_id);
+                return;
+            }
+        };
+
+        let mut blocks = VectorBlocks::with_quantization(
+            self.dimensionality,
+            self.config.block_size,
+            self.config.quantization,
+        );
+        for child_id in &container.children {
+            if let Some(child) = self.containers.get(child_id) {
+                if child.is_leaf() {
+                    blocks.push(*child_id, child.centroid.dims());
+                }
+            }
+        }
+
+        self.chunk_blocks.insert(container_id, blocks);
+    }
+
+    /// Rebuild the tiles of every document
+    fn rebuild_all_blocks(&mut self) {
+        self.chunk_blocks.clear();
+        for doc_id in self.containers_at_level(ContainerLevel::Document) {
+            self.rebuild_blocks(doc_id);
+        }
+    }
+
     /// Ensure root exists
     fn ensure_root(&mut self) {
         if self.root_id.is_none() {
@@ -780,18 +902,31 @@ impl HatIndex {
         // Adaptive beam width based on k
         let beam_width = self.config.beam_width.max(k);
 
-        // BFS with beam search
-        let mut current_level = vec![start_id];
+        // Norm and int8 codes are computed once for every document scanned
+        let scan_query = ScanQuery::new(query.dims());
+
+        // BFS with beam search; each entry carries the distance it was
+        // ranked by, so leaves are not scored a second time
+        let mut current_level: Vec<(Id, Option<f32>)> = vec![(start_id, None)];
 
         while !current_level.is_empty() {
             let mut next_level: Vec<(Id, f32)> = Vec::new();
 
-            for container_id in &current_level {
+            for (container_id, ranked_by) in &current_level {
                 if let Some(container) = self.containers.get(container_id) {
                     if container.is_leaf() {
                         // Leaf node - add to results
-                        let dist = self.combined_distance(query, query_time, container);
+                        let dist = match ranked_by {
+                            // Int8 tile scores only rank the beam; results are exact
+                            Some(dist) if self.config.quantization == Quantization::F32 => *dist,
+                            _ => self.combined_distance(query, query_time, container),
+                        };
                         results.push((*container_id, dist));
+                    } else if let Some(scored) =
+                        self.tiled_chunk_distances(*container_id, &scan_query, query_time)
+                    {
+                        // Document - score all chunks in one scan over its tiles
+                        next_level.extend(scored);
                     } else {
                         // Internal node - score children and add to next level
                         for child_id in &container.children {
@@ -813,7 +948,7 @@ impl HatIndex {
             current_level = next_level
                 .into_iter()
                 .take(beam_width)
-                .map(|(id, _)| id)
+                .map(|(id, dist)| (id, Some(dist)))
                 .collect();
         }
 
@@ -942,19 +1077,28 @@ impl HatIndex {
             None => return Ok(vec![]),
         };
 
-        let mut chunks: Vec<SearchResult> = doc.children
-            .iter()
-            .filter_map(|chunk_id| {
-                let chunk = self.containers.get(chunk_id)?;
-                if chunk.level != ContainerLevel::Chunk {
-                    return None;
-                }
-                let dist = self.combined_distance(query, query_time, chunk);
-                let score = if self.higher_is_better { 1.0 - dist } else { dist };
+        let tiled = self.tiled_chunk_distances(doc_id, &ScanQuery::new(query.dims()), query_time);
 
-                Some(SearchResult::new(*chunk_id, score))
-            })
-            .collect();
+        let mut chunks: Vec<SearchResult> = match tiled {
+            // The tiled path only runs for cosine, where higher is better
+            Some(scored) => scored
+                .into_iter()
+                .map(|(id, dist)| SearchResult::new(id, 1.0 - dist))
+                .collect(),
+            None => doc.children
+                .iter()
+                .filter_map(|chunk_id| {
+                    let chunk = self.containers.get(chunk_id)?;
+                    if chunk.level != ContainerLevel::Chunk {
+                        return None;
+                    }
+                    let dist = self.combined_distance(query, query_time, chunk);
+                    let score = if self.higher_is_better { 1.0 - dist } else { dist };
+
+                    Some(SearchResult::new(*chunk_id, score))
+                })
+                .collect(),
+        };
 
         chunks.sort_by(|a, b| b.score.partial_cmp(&a.score).unwrap());
         chunks.truncate(k);
@@ -1137,6 +1281,16 @@ impl Near for HatIndex {
             if let Some(doc) = self.containers.get_mut(&doc_id) {
                 doc.children.push(id);
             }
+            self.chunk_blocks
+                .entry(doc_id)
+                .or_insert_with(|| {
+                    VectorBlocks::with_quantization(
+                        self.dimensionality,
+                        self.config.block_size,
+                        self.config.quantization,
+                    )
+                })
+                .push(id, point.dims());
 
             // Build ancestor chain for sparse propagation
             let mut ancestors = Vec::new();
@@ -1284,6 +1438,9 @@ impl HatIndex {
             None
         };
 
+        // Children may have moved (merge/split) - re-tile the document's chunks
+        self.rebuild_blocks(container_id);
+
         drift
     }
 
@@ -1341,8 +1498,26 @@ impl HatIndex {
         smallest.map(|(id, _)| id)
     }
 
+    /// Point the active session/document at `new` if it was `old`
+    ///
+    /// Inserts go to the active containers, so one that is merged away or
+    /// pruned must not stay active or later chunks would be orphaned.
+    fn repoint_active(&mut self, old: Id, new: Option<Id>) {
+        if self.active_session == Some(old) {
+            self.active_session = new;
+        }
+        if self.active_document == Some(old) {
+            self.active_document = new;
+        }
+    }
+
     /// Merge container B into container A
     fn merge_containers(&mut self, a_id: Id, b_id: Id) {
+        // A may already have been merged away earlier in this batch
+        if !self.containers.contains_key(&a_id) {
+            return;
+        }
+
         // Get children from B
         let b_children: Vec<Id> = if let Some(b) = self.containers.get(&b_id) {
             b.children.clone()
@@ -1368,6 +1543,8 @@ impl HatIndex {
 
         // Remove B
         self.containers.remove(&b_id);
+        self.chunk_blocks.remove(&b_id);
+        self.repoint_active(b_id, Some(a_id));
 
         // Recompute A's centroid
         self.recompute_centroid(a_id);
@@ -1457,6 +1634,8 @@ impl HatIndex {
                 }
 
                 self.containers.remove(&id);
+                self.chunk_blocks.remove(&id);
+                self.repoint_active(id, None);
                 pruned += 1;
             }
         }
@@ -1732,7 +1911,6 @@ impl HatIndex {
     /// ```
     pub fn from_bytes(data: &[u8]) -> Result<Self, super::persistence::PersistError> {
         use super::persistence::{SerializedHat, LevelByte, PersistError};
-        use crate::core::proximity::Cosine;
         use crate::core::merge::Mean;
 
         let serialized = SerializedHat::from_bytes(data)?;
@@ -1741,7 +1919,7 @@ impl HatIndex {
         // Create a new index with default settings
         let mut index = Self::new(
             dimensionality,
-            Arc::new(Cosine),
+            cosine_proximity(dimensionality),
             Arc::new(Mean),
             true,
             HatConfig::default(),
@@ -1785,6 +1963,8 @@ impl HatIndex {
             index.containers.insert(sc.id, container);
         }
 
+        index.rebuild_all_blocks();
+
         // Restore state
         index.root_id = serialized.root_id;
         index.active_session = serialized.active_session;
@@ -1816,6 +1996,38 @@ impl HatIndex {
         let bytes = std::fs::read(path)?;
         Self::from_bytes(&bytes)
     }
+
+    /// Load an index from a memory-mapped file
+    ///
+    /// Parses straight out of the page cache instead of copying the whole
+    /// file into a buffer first, so peak memory during load is the index
+    /// itself.
+    ///
+    /// The file must not be truncated or rewritten while it is being
+    /// loaded: the mapping is not a snapshot, and touching a page that no
+    /// longer exists raises SIGBUS and kills the process instead of
+    /// returning an error. Use `load_from_file` for files other processes
+    /// may write to.
+    #[cfg(feature = "mmap")]
+    pub fn load_mmap(path: &std::path::Path) -> Result<Self, super::persistence::PersistError> {
+        let file = std::fs::File::open(path)?;
+        // SAFETY: the mapping is read-only and dropped before returning;
+        // concurrent truncation by another process is the caller's contract
+        let mmap = unsafe { memmap2::Mmap::map(&file)? };
+        Self::from_bytes(&mmap)
+    }
+}
+
+/// Cosine proximity, specialized when the dimensionality has a fixed kernel
+fn cosine_proximity(dimensionality: usize) -> Arc<dyn Proximity> {
+    use crate::core::proximity::{Cosine, Cosine1536, Cosine384, Cosine768};
+
+    match dimensionality {
+        384 => Arc::new(Cosine384),
+        768 => Arc::new(Cosine768),
+        1536 => Arc::new(Cosine1536),
+        _ => Arc::new(Cosine),
+    }
 }
 
 #[cfg(test)]
@@ -1930,6 +2142,180 @@ mod tests {
         }
     }
 
+    #[test]
+    fn test_hat_tiled_scan_matches_cosine() {
+        use crate::core::proximity::Cosine;
+
+        let mut index = HatIndex::cosine(16).with_config(HatConfig::new().with_block_size(4));
+
+        let mut points = Vec::new();
+        for i in 0..30 {
+            let dims: Vec<f32> = (0..16).map(|d| ((i * 16 + d) as f32 * 0.13).cos()).collect();
+            let point = Point::new(dims);
+            index.add(Id::now(), &point).unwrap();
+            points.push(point);
+        }
+
+        let doc_id = index.active_document.unwrap();
+        let query = Point::new((0..16).map(|d| d as f32 * 0.1 - 0.5).collect());
+        let results = index.near_in_document(doc_id, &query, 30).unwrap();
+        assert_eq!(results.len(), 30);
+
+        for result in &results {
+            let chunk = index.containers.get(&result.id).unwrap();
+            let expected = Cosine.proximity(&query, &chunk.centroid);
+            assert!((result.score - expected).abs() < 1e-5);
+        }
+    }
+
+    #[test]
+    fn test_hat_cosine_int8_finds_exact_match() {
+        let mut index = HatIndex::cosine_int8(64);
+        assert_eq!(index.config.quantization, Quantization::Int8);
+
+        let mut ids = Vec::new();
+        let mut points = Vec::new();
+        for i in 0..200 {
+            if i % 50 == 0 {
+                index.new_document();
+            }
+            let dims: Vec<f32> = (0..64).map(|d| ((i * 64 + d) as f32 * 0.37).sin()).collect();
+            let id = Id::now();
+            let point = Point::new(dims);
+            index.add(id, &point).unwrap();
+            ids.push(id);
+            points.push(point);
+        }
+
+        for i in [0, 73, 199] {
+            let results = index.near(&points[i], 5).unwrap();
+            assert_eq!(results[0].id, ids[i]);
+            assert!((results[0].score - 1.0).abs() < 0.01);
+        }
+    }
+
+    #[test]
+    fn test_hat_consolidation_interleaved_with_inserts() {
+        let mut index = HatIndex::cosine(16);
+
+        // Deterministic, well-spread vectors (one splitmix64 draw per dimension)
+        let embed = |i: usize| {
+            Point::new(
+                (0..16u64)
+                    .map(|d| {
+                        let mut z = (i as u64 * 16 + d).wrapping_mul(0x9E37_79B9_7F4A_7C15);
+                        z = (z ^ (z >> 30)).wrapping_mul(0xBF58_476D_1CE4_E5B9);
+                        z = (z ^ (z >> 27)).wrapping_mul(0x94D0_49BB_1331_11EB);
+                        ((z ^ (z >> 31)) >> 40) as f32 / (1u64 << 24) as f32 - 0.5
+                    })
+                    .collect(),
+            )
+        };
+
+        for i in 0..200 {
+            if i % 20 == 0 {
+                index.new_document();
+            }
+            index.add(Id::now(), &embed(i)).unwrap();
+        }
+
+        // Inserts land between ticks, as they do when a caller releases
+        // its lock after every tick
+        index.begin_consolidation(ConsolidationConfig::full());
+        let mut added = Vec::new();
+        let mut i = 200;
+        loop {
+            let id = Id::now();
+            index.add(id, &embed(i)).unwrap();
+            added.push((id, i));
+            i += 1;
+
+            if let ConsolidationTickResult::Complete(_) = index.consolidation_tick() {
+                break;
+            }
+        }
+
+        assert_eq!(index.len(), i);
+
+        // Every insert is attached to a document and scannable there
+        for (id, i) in added {
+            let doc_id = index
+                .containers
+                .values()
+                .find(|c| c.level == ContainerLevel::Document && c.children.contains(&id))
+                .map(|c| c.id)
+                .expect("chunk attached to a document");
+            let results = index.near_in_document(doc_id, &embed(i), 1).unwrap();
+            assert_eq!(results[0].id, id);
+        }
+    }
+
+    #[test]
+    fn test_hat_consolidation_merges_active_document() {
+        let mut index = HatIndex::cosine(3);
+        let embed = |i: usize| Point::new(vec![1.0, i as f32, (i * i) as f32 * 0.01]);
+
+        // A small finished document and a smaller active one: consolidation
+        // merges the active document into its sibling
+        let mut ids = Vec::new();
+        for i in 0..3 {
+            if i == 2 {
+                index.new_document();
+            }
+            let id = Id::now();
+            index.add(id, &embed(i)).unwrap();
+            ids.push((id, i));
+        }
+
+        index.begin_consolidation(ConsolidationConfig::full());
+        let mut i = 3;
+        loop {
+            let id = Id::now();
+            index.add(id, &embed(i)).unwrap();
+            ids.push((id, i));
+            i += 1;
+
+            if let ConsolidationTickResult::Complete(_) = index.consolidation_tick() {
+                break;
+            }
+        }
+
+        let id = Id::now();
+        index.add(id, &embed(i)).unwrap();
+        ids.push((id, i));
+
+        let active = index.active_document.expect("active document");
+        assert!(index.containers.contains_key(&active));
+        assert!(index.chunk_blocks.keys().all(|id| index.containers.contains_key(id)));
+
+        for (id, i) in ids {
+            let doc_id = index
+                .containers
+                .values()
+                .find(|c| c.level == ContainerLevel::Document && c.children.contains(&id))
+                .map(|c| c.id)
+                .expect("chunk attached to a document");
+            let results = index.near_in_document(doc_id, &embed(i), 1).unwrap();
+            assert_eq!(results[0].id, id);
+        }
+    }
+
+    #[test]
+    fn test_hat_remove_skips_tiled_chunk() {
+        let mut index = HatIndex::cosine(3);
+
+        let removed = Id::now();
+        index.add(removed, &Point::new(vec![1.0, 0.0, 0.0])).unwrap();
+        let kept = Id::now();
+        index.add(kept, &Point::new(vec![0.0, 1.0, 0.0])).unwrap();
+
+        index.remove(removed).unwrap();
+
+        let results = index.near(&Point::new(vec![1.0, 0.0, 0.0]), 5).unwrap();
+        assert_eq!(results.len(), 1);
+        assert_eq!(results[0].id, kept);
+    }
+
     #[test]
     fn test_hat_scale() {
         let mut index = HatIndex::cosine(128);
@@ -1950,4 +2336,31 @@ mod tests {
 
         assert_eq!(results.len(), 10);
     }
+
+    #[cfg(feature = "mmap")]
+    #[test]
+    fn test_hat_load_mmap_roundtrip() {
+        let embed = |i: usize| Point::new((0..8).map(|d| ((i * 8 + d) as f32 * 0.37).sin()).collect());
+
+        let mut index = HatIndex::cosine(8);
+        for i in 0..30 {
+            if i % 10 == 0 {
+                index.new_document();
+            }
+            index.add(Id::now(), &embed(i)).unwrap();
+        }
+
+        let path = std::env::temp_dir().join(format!("hat_load_mmap_{}.hat", Id::now()));
+        index.save_to_file(&path).unwrap();
+        let mapped = HatIndex::load_mmap(&path);
+        std::fs::remove_file(&path).unwrap();
+        let mapped = mapped.unwrap();
+
+        assert_eq!(mapped.len(), index.len());
+        for i in [0, 15, 29] {
+            let expected: Vec<Id> = index.near(&embed(i), 5).unwrap().iter().map(|r| r.id).collect();
+            let got: Vec<Id> = mapped.near(&embed(i), 5).unwrap().iter().map(|r| r.id).collect();
+            assert_eq!(got, expected);
+        }
+    }
 }
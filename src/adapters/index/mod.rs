@@ -14,18 +14,25 @@
 //! - `Subspace` representation for containers capturing variance/spread
 //! - `SubspaceConfig` for configuring subspace-aware routing
 //!
+//! Vector storage:
+//! - `VectorBlocks` stores chunk vectors in AoSoA tiles for SIMD-friendly scans
+//! - `Quantization` selects f32 tiles or int8 (per-vector scale) rows
+//! - `ScanQuery` prepares a query once for scanning many containers
+//!
 //! Learnable routing:
 //! - `LearnableRouter` for adapting routing weights from feedback
 //! - `LearnableRoutingConfig` for configuring online learning
 
 mod flat;
 mod hat;
+mod blocks;
 mod consolidation;
 mod subspace;
 mod learnable_routing;
 mod persistence;
 
 pub use flat::FlatIndex;
+pub use blocks::{Quantization, ScanQuery, VectorBlocks, DEFAULT_BLOCK_SIZE};
 pub use hat::{HatIndex, HatConfig, CentroidMethod, ContainerLevel, SessionSummary, DocumentSummary, HatStats};
 pub use consolidation::{
     Consolidate, ConsolidationConfig, ConsolidationLevel, ConsolidationPhase,
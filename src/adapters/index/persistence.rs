@@ -46,6 +46,9 @@
 //! // Load
 //! let bytes = std::fs::read("index.hat")?;
 //! let hat = HatIndex::from_bytes(&bytes)?;
+//!
+//! // Load through a memory map (feature "mmap")
+//! let hat = HatIndex::load_mmap(Path::new("index.hat"))?;
 //! ```
 
 use crate::core::{Id, Point};
@@ -291,24 +294,13 @@ impl SerializedHat {
             let descendant_count = u64::from_le_bytes(desc_bytes);
 
             // Centroid
-            let mut centroid = Vec::with_capacity(dimensionality as usize);
-            for _ in 0..dimensionality {
-                let mut v_bytes = [0u8; 4];
-                cursor.read_exact(&mut v_bytes)?;
-                centroid.push(f32::from_le_bytes(v_bytes));
-            }
+            let centroid = read_f32s(&mut cursor, dimensionality as usize)?;
 
             // Accumulated sum
             let mut has_sum = [0u8; 1];
             cursor.read_exact(&mut has_sum)?;
             let accumulated_sum = if has_sum[0] == 1 {
-                let mut sum = Vec::with_capacity(dimensionality as usize);
-                for _ in 0..dimensionality {
-                    let mut v_bytes = [0u8; 4];
-                    cursor.read_exact(&mut v_bytes)?;
-                    sum.push(f32::from_le_bytes(v_bytes));
-                }
-                Some(sum)
+                Some(read_f32s(&mut cursor, dimensionality as usize)?)
             } else {
                 None
             };
@@ -346,13 +338,7 @@ impl SerializedHat {
             let mut has_weights = [0u8; 1];
             cursor.read_exact(&mut has_weights)?;
             if has_weights[0] == 1 {
-                let mut weights = Vec::with_capacity(dimensionality as usize);
-                for _ in 0..dimensionality {
-                    let mut w_bytes = [0u8; 4];
-                    cursor.read_exact(&mut w_bytes)?;
-                    weights.push(f32::from_le_bytes(w_bytes));
-                }
-                Some(weights)
+                Some(read_f32s(&mut cursor, dimensionality as usize)?)
             } else {
                 None
             }
@@ -372,6 +358,24 @@ impl SerializedHat {
     }
 }
 
+/// Read `n` little-endian f32s as one contiguous slice of the input
+fn read_f32s(cursor: &mut Cursor<&[u8]>, n: usize) -> Result<Vec<f32>, PersistError> {
+    let start = cursor.position() as usize;
+    let end = n
+        .checked_mul(4)
+        .and_then(|len| start.checked_add(len))
+        .filter(|&end| end <= cursor.get_ref().len())
+        .ok_or_else(|| PersistError::Io(io::ErrorKind::UnexpectedEof.into()))?;
+
+    let values = cursor.get_ref()[start..end]
+        .chunks_exact(4)
+        .map(|b| f32::from_le_bytes([b[0], b[1], b[2], b[3]]))
+        .collect();
+    cursor.set_position(end as u64);
+
+    Ok(values)
+}
+
 /// Helper to read ID from Option
 fn id_to_bytes(id: &Option<Id>) -> [u8; 16] {
     match id {
@@ -424,6 +428,32 @@ mod tests {
         assert!(restored.router_weights.is_some());
     }
 
+    #[test]
+    fn test_truncated_vector() {
+        let hat = SerializedHat {
+            version: VERSION,
+            dimensionality: 4,
+            root_id: None,
+            containers: vec![SerializedContainer {
+                id: Id::now(),
+                level: LevelByte::Chunk,
+                timestamp: 0,
+                children: vec![],
+                descendant_count: 1,
+                centroid: vec![1.0, 2.0, 3.0, 4.0],
+                accumulated_sum: None,
+            }],
+            active_session: None,
+            active_document: None,
+            router_weights: None,
+        };
+
+        let bytes = hat.to_bytes().unwrap();
+        // Cut inside the centroid: header (36) + id/level/ts/children/desc (37) + 8 bytes
+        let result = SerializedHat::from_bytes(&bytes[..36 + 37 + 8]);
+        assert!(matches!(result, Err(PersistError::Io(_))));
+    }
+
     #[test]
     fn test_invalid_magic() {
         let bad_data = b"BAD\0rest of data...";
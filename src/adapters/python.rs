@@ -5,19 +5,23 @@
 //! ## Python API
 //!
 //! ```python
+//! import numpy as np
 //! from arms_hat import HatIndex, SearchResult
 //!
 //! # Create index for OpenAI embeddings (1536 dims)
 //! index = HatIndex.cosine(1536)
 //!
-//! # Add embeddings
-//! id = index.add([0.1, 0.2, ...])  # Auto-generates ID
-//! index.add_with_id("custom_id", [0.1, 0.2, ...])  # Custom ID
+//! # Add embeddings (1-D float32 arrays are copied straight from the buffer)
+//! embedding = np.full(1536, 0.1, dtype=np.float32)
+//! id = index.add(embedding)  # Auto-generates ID
+//! index.add_with_id("custom_id", embedding)  # Custom ID
+//! ids = index.add_many(np.zeros((100, 1536), dtype=np.float32))  # Batch
 //!
 //! # Query
-//! results = index.near([0.1, 0.2, ...], k=10)
+//! results = index.near(embedding, k=10)
 //! for result in results:
 //!     print(f"{result.id}: {result.score}")
+//! ids, scores = index.near_batch(embedding, k=10)  # Columnar: list + float32 array
 //!
 //! # Session management
 //! index.new_session()
@@ -29,11 +33,15 @@
 //! ```
 
 use pyo3::prelude::*;
-use pyo3::exceptions::{PyValueError, PyIOError};
+use pyo3::exceptions::{PyDeprecationWarning, PyValueError, PyIOError};
+use numpy::{PyArray1, PyReadonlyArray1, PyReadonlyArray2};
+use parking_lot::RwLock;
 
 use crate::core::{Id, Point};
-use crate::adapters::index::{HatIndex as RustHatIndex, HatConfig, ConsolidationConfig, Consolidate};
-use crate::ports::Near;
+use crate::adapters::index::{
+    HatIndex as RustHatIndex, HatConfig, ConsolidationConfig, ConsolidationTickResult, Consolidate,
+};
+use crate::ports::{Near, NearResult, SearchResult};
 
 /// Python wrapper for search results
 #[pyclass(name = "SearchResult")]
@@ -91,10 +99,18 @@ impl PyHatConfig {
         slf
     }
 
+    /// Set lanes per AoSoA tile for stored chunk vectors
+    /// (default: 16 on x86_64, 8 on aarch64)
+    fn with_block_size(mut slf: PyRefMut<'_, Self>, block_size: usize) -> PyRefMut<'_, Self> {
+        slf.inner.block_size = block_size.max(1);
+        slf
+    }
+
     fn __repr__(&self) -> String {
         format!(
-            "HatConfig(beam_width={}, temporal_weight={:.2}, propagation_threshold={:.3})",
-            self.inner.beam_width, self.inner.temporal_weight, self.inner.propagation_threshold
+            "HatConfig(beam_width={}, temporal_weight={:.2}, propagation_threshold={:.3}, block_size={})",
+            self.inner.beam_width, self.inner.temporal_weight, self.inner.propagation_threshold,
+            self.inner.block_size
         )
     }
 }
@@ -188,9 +204,65 @@ impl PyHatStats {
 /// A semantic memory index optimized for conversation history retrieval.
 /// Uses hierarchical structure (session -> document -> chunk) to enable
 /// O(log n) queries while maintaining high recall.
+///
+/// The index is safe to share between threads: searches run in parallel,
+/// while inserts and consolidation steps take exclusive access. The GIL is
+/// released while waiting for the index, so a long consolidation on one
+/// thread never blocks unrelated Python code on another.
 #[pyclass(name = "HatIndex")]
 pub struct PyHatIndex {
-    inner: RustHatIndex,
+    inner: RwLock<RustHatIndex>,
+}
+
+impl PyHatIndex {
+    fn new(inner: RustHatIndex) -> Self {
+        Self { inner: RwLock::new(inner) }
+    }
+
+    /// Run `f` with shared access to the index, outside the GIL
+    fn read<R: Send>(&self, py: Python<'_>, f: impl FnOnce(&RustHatIndex) -> R + Send) -> R {
+        py.allow_threads(|| f(&self.inner.read()))
+    }
+
+    /// Run `f` with exclusive access to the index, outside the GIL
+    fn write<R: Send>(&self, py: Python<'_>, f: impl FnOnce(&mut RustHatIndex) -> R + Send) -> R {
+        py.allow_threads(|| f(&mut self.inner.write()))
+    }
+
+    /// Nearest-neighbor search shared by `near` and `near_batch`
+    fn search(&self, py: Python<'_>, query: &Bound<'_, PyAny>, k: usize) -> PyResult<Vec<SearchResult>> {
+        let point = Point::new(extract_embedding(query)?);
+
+        // Shared access outside the GIL, so concurrent queries run in parallel
+        self.read(py, |index| index.near(&point, k))
+            .map_err(|e| PyValueError::new_err(format!("{}", e)))
+    }
+
+    /// Run a consolidation one tick at a time
+    ///
+    /// The write lock is dropped between ticks, so searches and inserts
+    /// interleave with a long consolidation instead of waiting for all of
+    /// it; each tick still excludes them for its own duration.
+    ///
+    /// Returns at once if another thread's pass is still running: starting
+    /// a second pass would reset the shared state under the first.
+    fn run_consolidation(&self, py: Python<'_>, config: ConsolidationConfig) {
+        py.allow_threads(|| {
+            {
+                let mut index = self.inner.write();
+                if index.is_consolidating() {
+                    return;
+                }
+                index.begin_consolidation(config);
+            }
+            loop {
+                let tick = self.inner.write().consolidation_tick();
+                if let ConsolidationTickResult::Complete(_) = tick {
+                    break;
+                }
+            }
+        })
+    }
 }
 
 #[pymethods]
@@ -201,9 +273,27 @@ impl PyHatIndex {
     ///     dimensionality: Number of embedding dimensions (e.g., 1536 for OpenAI)
     #[staticmethod]
     fn cosine(dimensionality: usize) -> Self {
-        Self {
-            inner: RustHatIndex::cosine(dimensionality),
-        }
+        Self::new(RustHatIndex::cosine(dimensionality))
+    }
+
+    /// Create a cosine index that stores chunk vectors as int8
+    ///
+    /// Each vector keeps one byte per dimension plus a float scale, so
+    /// scans see 4x less memory traffic. The full-precision vectors are
+    /// kept as well, so the index uses about 25% more memory, not less.
+    /// `near` picks candidates by int8 score but returns exact cosine
+    /// scores. `near_in_document` returns the int8 scores, which are
+    /// typically within 0.01 of exact cosine.
+    ///
+    /// The int8 mode and block size are not saved: `save`/`to_bytes`
+    /// followed by `load`/`from_bytes` yields an f32 index with default
+    /// config.
+    ///
+    /// Args:
+    ///     dimensionality: Number of embedding dimensions
+    #[staticmethod]
+    fn cosine_int8(dimensionality: usize) -> Self {
+        Self::new(RustHatIndex::cosine_int8(dimensionality))
     }
 
     /// Create a new HAT index with custom configuration
@@ -213,38 +303,69 @@ impl PyHatIndex {
     ///     config: HatConfig instance
     #[staticmethod]
     fn with_config(dimensionality: usize, config: &PyHatConfig) -> Self {
-        Self {
-            inner: RustHatIndex::cosine(dimensionality).with_config(config.inner.clone()),
-        }
+        Self::new(RustHatIndex::cosine(dimensionality).with_config(config.inner.clone()))
     }
 
     /// Add an embedding to the index
     ///
     /// Args:
-    ///     embedding: List of floats (must match dimensionality)
+    ///     embedding: 1-D float32 numpy array (must match dimensionality);
+    ///         other sequences are converted element-wise and deprecated
     ///
     /// Returns:
     ///     str: The generated ID as a hex string
-    fn add(&mut self, embedding: Vec<f32>) -> PyResult<String> {
-        let point = Point::new(embedding);
+    fn add(&self, py: Python<'_>, embedding: &Bound<'_, PyAny>) -> PyResult<String> {
+        let point = Point::new(extract_embedding(embedding)?);
         let id = Id::now();
 
-        self.inner.add(id, &point)
+        self.write(py, |index| index.add(id, &point))
             .map_err(|e| PyValueError::new_err(format!("{}", e)))?;
 
         Ok(format!("{}", id))
     }
 
+    /// Add a batch of embeddings to the index in a single call
+    ///
+    /// Args:
+    ///     embeddings: 2-D float32 numpy array of shape (n, dimensionality)
+    ///
+    /// Returns:
+    ///     List[str]: The generated IDs, one per row, in row order
+    fn add_many(&self, py: Python<'_>, embeddings: PyReadonlyArray2<'_, f32>) -> PyResult<Vec<String>> {
+        // Copy out of the numpy buffer while the GIL still guards it
+        let points: Vec<Point> = embeddings
+            .as_array()
+            .rows()
+            .into_iter()
+            .map(|row| Point::new(row.to_vec()))
+            .collect();
+
+        // One exclusive section for the whole batch
+        let ids = self.write(py, |index| -> NearResult<Vec<Id>> {
+            let mut ids = Vec::with_capacity(points.len());
+            for point in &points {
+                let id = Id::now();
+                index.add(id, point)?;
+                ids.push(id);
+            }
+            Ok(ids)
+        })
+        .map_err(|e| PyValueError::new_err(format!("{}", e)))?;
+
+        Ok(ids.into_iter().map(|id| format!("{}", id)).collect())
+    }
+
     /// Add an embedding with a custom ID
     ///
     /// Args:
     ///     id_hex: 32-character hex string for the ID
-    ///     embedding: List of floats (must match dimensionality)
-    fn add_with_id(&mut self, id_hex: &str, embedding: Vec<f32>) -> PyResult<()> {
+    ///     embedding: 1-D float32 numpy array (must match dimensionality);
+    ///         other sequences are converted element-wise and deprecated
+    fn add_with_id(&self, py: Python<'_>, id_hex: &str, embedding: &Bound<'_, PyAny>) -> PyResult<()> {
         let id = parse_id_hex(id_hex)?;
-        let point = Point::new(embedding);
+        let point = Point::new(extract_embedding(embedding)?);
 
-        self.inner.add(id, &point)
+        self.write(py, |index| index.add(id, &point))
             .map_err(|e| PyValueError::new_err(format!("{}", e)))?;
 
         Ok(())
@@ -253,16 +374,13 @@ impl PyHatIndex {
     /// Find k nearest neighbors to a query embedding
     ///
     /// Args:
-    ///     query: Query embedding (list of floats)
+    ///     query: Query embedding (1-D float32 numpy array)
     ///     k: Number of results to return
     ///
     /// Returns:
     ///     List[SearchResult]: Results sorted by relevance (best first)
-    fn near(&self, query: Vec<f32>, k: usize) -> PyResult<Vec<PySearchResult>> {
-        let point = Point::new(query);
-
-        let results = self.inner.near(&point, k)
-            .map_err(|e| PyValueError::new_err(format!("{}", e)))?;
+    fn near(&self, py: Python<'_>, query: &Bound<'_, PyAny>, k: usize) -> PyResult<Vec<PySearchResult>> {
+        let results = self.search(py, query, k)?;
 
         Ok(results.into_iter().map(|r| PySearchResult {
             id: format!("{}", r.id),
@@ -270,24 +388,52 @@ impl PyHatIndex {
         }).collect())
     }
 
+    /// Find k nearest neighbors, returned column-wise
+    ///
+    /// Same results as `near`, without one SearchResult object per hit.
+    ///
+    /// Args:
+    ///     query: Query embedding (1-D float32 numpy array)
+    ///     k: Number of results to return
+    ///
+    /// Returns:
+    ///     Tuple[List[str], np.ndarray]: IDs and float32 scores, best first
+    fn near_batch<'py>(
+        &self,
+        py: Python<'py>,
+        query: &Bound<'py, PyAny>,
+        k: usize,
+    ) -> PyResult<(Vec<String>, Bound<'py, PyArray1<f32>>)> {
+        let results = self.search(py, query, k)?;
+
+        let mut ids = Vec::with_capacity(results.len());
+        let mut scores = Vec::with_capacity(results.len());
+        for r in results {
+            ids.push(format!("{}", r.id));
+            scores.push(r.score);
+        }
+
+        Ok((ids, PyArray1::from_vec_bound(py, scores)))
+    }
+
     /// Start a new session (conversation boundary)
     ///
     /// Call this when starting a new conversation or context.
-    fn new_session(&mut self) {
-        self.inner.new_session();
+    fn new_session(&self, py: Python<'_>) {
+        self.write(py, |index| index.new_session());
     }
 
     /// Start a new document within the current session
     ///
     /// Call this for logical groupings within a conversation
     /// (e.g., topic change, user turn).
-    fn new_document(&mut self) {
-        self.inner.new_document();
+    fn new_document(&self, py: Python<'_>) {
+        self.write(py, |index| index.new_document());
     }
 
     /// Get index statistics
-    fn stats(&self) -> PyHatStats {
-        let s = self.inner.stats();
+    fn stats(&self, py: Python<'_>) -> PyHatStats {
+        let s = self.read(py, |index| index.stats());
         PyHatStats {
             global_count: s.global_count,
             session_count: s.session_count,
@@ -297,23 +443,23 @@ impl PyHatIndex {
     }
 
     /// Get the number of indexed points
-    fn __len__(&self) -> usize {
-        self.inner.len()
+    fn __len__(&self, py: Python<'_>) -> usize {
+        self.read(py, |index| index.len())
     }
 
     /// Check if the index is empty
-    fn is_empty(&self) -> bool {
-        self.inner.is_empty()
+    fn is_empty(&self, py: Python<'_>) -> bool {
+        self.read(py, |index| index.is_empty())
     }
 
     /// Remove a point by ID
     ///
     /// Args:
     ///     id_hex: 32-character hex string for the ID
-    fn remove(&mut self, id_hex: &str) -> PyResult<()> {
+    fn remove(&self, py: Python<'_>, id_hex: &str) -> PyResult<()> {
         let id = parse_id_hex(id_hex)?;
 
-        self.inner.remove(id)
+        self.write(py, |index| index.remove(id))
             .map_err(|e| PyValueError::new_err(format!("{}", e)))?;
 
         Ok(())
@@ -322,15 +468,15 @@ impl PyHatIndex {
     /// Find similar sessions (coarse-grained search)
     ///
     /// Args:
-    ///     query: Query embedding
+    ///     query: Query embedding (1-D float32 numpy array)
     ///     k: Number of sessions to return
     ///
     /// Returns:
     ///     List[SessionSummary]: Most relevant sessions
-    fn near_sessions(&self, query: Vec<f32>, k: usize) -> PyResult<Vec<PySessionSummary>> {
-        let point = Point::new(query);
+    fn near_sessions(&self, py: Python<'_>, query: &Bound<'_, PyAny>, k: usize) -> PyResult<Vec<PySessionSummary>> {
+        let point = Point::new(extract_embedding(query)?);
 
-        let results = self.inner.near_sessions(&point, k)
+        let results = self.read(py, |index| index.near_sessions(&point, k))
             .map_err(|e| PyValueError::new_err(format!("{}", e)))?;
 
         Ok(results.into_iter().map(|s| PySessionSummary {
@@ -345,16 +491,16 @@ impl PyHatIndex {
     ///
     /// Args:
     ///     session_id: Session ID (hex string)
-    ///     query: Query embedding
+    ///     query: Query embedding (1-D float32 numpy array)
     ///     k: Number of documents to return
     ///
     /// Returns:
     ///     List[DocumentSummary]: Most relevant documents in the session
-    fn near_documents(&self, session_id: &str, query: Vec<f32>, k: usize) -> PyResult<Vec<PyDocumentSummary>> {
+    fn near_documents(&self, py: Python<'_>, session_id: &str, query: &Bound<'_, PyAny>, k: usize) -> PyResult<Vec<PyDocumentSummary>> {
         let sid = parse_id_hex(session_id)?;
-        let point = Point::new(query);
+        let point = Point::new(extract_embedding(query)?);
 
-        let results = self.inner.near_documents(sid, &point, k)
+        let results = self.read(py, |index| index.near_documents(sid, &point, k))
             .map_err(|e| PyValueError::new_err(format!("{}", e)))?;
 
         Ok(results.into_iter().map(|d| PyDocumentSummary {
@@ -368,16 +514,16 @@ impl PyHatIndex {
     ///
     /// Args:
     ///     doc_id: Document ID (hex string)
-    ///     query: Query embedding
+    ///     query: Query embedding (1-D float32 numpy array)
     ///     k: Number of results to return
     ///
     /// Returns:
     ///     List[SearchResult]: Most relevant chunks in the document
-    fn near_in_document(&self, doc_id: &str, query: Vec<f32>, k: usize) -> PyResult<Vec<PySearchResult>> {
+    fn near_in_document(&self, py: Python<'_>, doc_id: &str, query: &Bound<'_, PyAny>, k: usize) -> PyResult<Vec<PySearchResult>> {
         let did = parse_id_hex(doc_id)?;
-        let point = Point::new(query);
+        let point = Point::new(extract_embedding(query)?);
 
-        let results = self.inner.near_in_document(did, &point, k)
+        let results = self.read(py, |index| index.near_in_document(did, &point, k))
             .map_err(|e| PyValueError::new_err(format!("{}", e)))?;
 
         Ok(results.into_iter().map(|r| PySearchResult {
@@ -389,22 +535,25 @@ impl PyHatIndex {
     /// Run light consolidation (background maintenance)
     ///
     /// This optimizes the index structure. Call periodically
-    /// (e.g., after every 100 inserts).
-    fn consolidate(&mut self) {
-        self.inner.consolidate(ConsolidationConfig::light());
+    /// (e.g., after every 100 inserts). Safe to call from a background
+    /// thread while other threads search and insert: inserts that land
+    /// between steps follow the active document if it is merged away.
+    /// Returns immediately if a consolidation is already running.
+    fn consolidate(&self, py: Python<'_>) {
+        self.run_consolidation(py, ConsolidationConfig::light());
     }
 
     /// Run full consolidation (more thorough optimization)
-    fn consolidate_full(&mut self) {
-        self.inner.consolidate(ConsolidationConfig::full());
+    fn consolidate_full(&self, py: Python<'_>) {
+        self.run_consolidation(py, ConsolidationConfig::full());
     }
 
     /// Save the index to a file
     ///
     /// Args:
     ///     path: File path to save to
-    fn save(&self, path: &str) -> PyResult<()> {
-        self.inner.save_to_file(std::path::Path::new(path))
+    fn save(&self, py: Python<'_>, path: &str) -> PyResult<()> {
+        self.read(py, |index| index.save_to_file(std::path::Path::new(path)))
             .map_err(|e| PyIOError::new_err(format!("{}", e)))
     }
 
@@ -420,7 +569,7 @@ impl PyHatIndex {
         let inner = RustHatIndex::load_from_file(std::path::Path::new(path))
             .map_err(|e| PyIOError::new_err(format!("{}", e)))?;
 
-        Ok(Self { inner })
+        Ok(Self::new(inner))
     }
 
     /// Serialize the index to bytes
@@ -428,7 +577,7 @@ impl PyHatIndex {
     /// Returns:
     ///     bytes: Serialized index data
     fn to_bytes<'py>(&self, py: Python<'py>) -> PyResult<Bound<'py, pyo3::types::PyBytes>> {
-        let data = self.inner.to_bytes()
+        let data = self.read(py, |index| index.to_bytes())
             .map_err(|e| PyIOError::new_err(format!("{}", e)))?;
         Ok(pyo3::types::PyBytes::new_bound(py, &data))
     }
@@ -445,11 +594,11 @@ impl PyHatIndex {
         let inner = RustHatIndex::from_bytes(data)
             .map_err(|e| PyIOError::new_err(format!("{}", e)))?;
 
-        Ok(Self { inner })
+        Ok(Self::new(inner))
     }
 
-    fn __repr__(&self) -> String {
-        let stats = self.inner.stats();
+    fn __repr__(&self, py: Python<'_>) -> String {
+        let stats = self.read(py, |index| index.stats());
         format!(
             "HatIndex(points={}, sessions={})",
             stats.chunk_count, stats.session_count
@@ -457,6 +606,29 @@ impl PyHatIndex {
     }
 }
 
+/// Extract an embedding, copying float32 numpy buffers directly
+///
+/// Anything else (lists, other dtypes) goes through the generic
+/// per-element sequence conversion and raises a DeprecationWarning.
+fn extract_embedding(obj: &Bound<'_, PyAny>) -> PyResult<Vec<f32>> {
+    if let Ok(array) = obj.extract::<PyReadonlyArray1<'_, f32>>() {
+        return Ok(match array.as_slice() {
+            Ok(slice) => slice.to_vec(),
+            Err(_) => array.as_array().to_vec(),
+        });
+    }
+
+    let py = obj.py();
+    PyErr::warn_bound(
+        py,
+        &py.get_type_bound::<PyDeprecationWarning>(),
+        "embeddings other than 1-D float32 numpy arrays are converted element by element; \
+         this is deprecated, pass np.asarray(embedding, dtype=np.float32)",
+        1,
+    )?;
+    obj.extract()
+}
+
 /// Parse a hex string to an Id
 fn parse_id_hex(hex: &str) -> PyResult<Id> {
     if hex.len() != 32 {
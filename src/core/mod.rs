@@ -8,6 +8,7 @@
 //! - `Blob` - Raw payload data
 //! - `Proximity` - Trait for measuring relatedness
 //! - `Merge` - Trait for composing points
+//! - `simd` - Vectorized kernels behind the proximity functions
 //!
 //! ## Design Principles
 //!
@@ -22,6 +23,7 @@ mod blob;
 pub mod proximity;
 pub mod merge;
 pub mod config;
+pub mod simd;
 
 // Re-exports
 pub use point::Point;
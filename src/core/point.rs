@@ -66,7 +66,7 @@ impl Point {
     /// assert!((p.magnitude() - 5.0).abs() < 0.0001);
     /// ```
     pub fn magnitude(&self) -> f32 {
-        self.dims.iter().map(|x| x * x).sum::<f32>().sqrt()
+        super::simd::dot_f32(&self.dims, &self.dims).sqrt()
     }
 
     /// Check if this point is normalized (magnitude ≈ 1.0)
@@ -8,6 +8,7 @@
 //! Proximity functions are pluggable - use whichever fits your use case.
 
 use super::Point;
+use super::simd::{cosine_fixed, dot_f32};
 
 /// Trait for measuring proximity between points
 ///
@@ -44,12 +45,7 @@ impl Proximity for Cosine {
             "Points must have same dimensionality"
         );
 
-        let dot: f32 = a
-            .dims()
-            .iter()
-            .zip(b.dims().iter())
-            .map(|(x, y)| x * y)
-            .sum();
+        let dot = dot_f32(a.dims(), b.dims());
 
         let mag_a = a.magnitude();
         let mag_b = b.magnitude();
@@ -66,6 +62,40 @@ impl Proximity for Cosine {
     }
 }
 
+/// Cosine similarity specialized for one fixed dimensionality
+///
+/// Points of that dimensionality go through `simd::cosine_fixed`, a fully
+/// unrolled single-pass kernel; any other dimensionality falls back to
+/// `Cosine`. Reports the name "cosine", so it is interchangeable with it.
+macro_rules! impl_cosine_fixed {
+    ($name:ident, $dims:literal) => {
+        #[doc = concat!("Cosine similarity specialized for ", stringify!($dims), "-dimensional points")]
+        #[derive(Clone, Copy, Debug, Default)]
+        pub struct $name;
+
+        impl Proximity for $name {
+            fn proximity(&self, a: &Point, b: &Point) -> f32 {
+                match (
+                    <&[f32; $dims]>::try_from(a.dims()),
+                    <&[f32; $dims]>::try_from(b.dims()),
+                ) {
+                    (Ok(a), Ok(b)) => cosine_fixed(a, b),
+                    _ => Cosine.proximity(a, b),
+                }
+            }
+
+            fn name(&self) -> &'static str {
+                "cosine"
+            }
+        }
+    };
+}
+
+// Common embedding widths: MiniLM, BERT-base, OpenAI ada-002
+impl_cosine_fixed!(Cosine384, 384);
+impl_cosine_fixed!(Cosine768, 768);
+impl_cosine_fixed!(Cosine1536, 1536);
+
 /// Euclidean distance
 ///
 /// The straight-line distance between two points.
@@ -143,11 +173,7 @@ impl Proximity for DotProduct {
             "Points must have same dimensionality"
         );
 
-        a.dims()
-            .iter()
-            .zip(b.dims().iter())
-            .map(|(x, y)| x * y)
-            .sum()
+        dot_f32(a.dims(), b.dims())
     }
 
     fn name(&self) -> &'static str {
@@ -210,6 +236,22 @@ mod tests {
         assert!(cos.abs() < 0.0001);
     }
 
+    #[test]
+    fn test_cosine_fixed_matches_cosine() {
+        let a = Point::new((0..384).map(|i| (i as f32 * 0.3).sin()).collect());
+        let b = Point::new((0..384).map(|i| (i as f32 * 0.7).cos()).collect());
+        let expected = Cosine.proximity(&a, &b);
+        assert!((Cosine384.proximity(&a, &b) - expected).abs() < 1e-5);
+        assert_eq!(Cosine384.name(), "cosine");
+    }
+
+    #[test]
+    fn test_cosine_fixed_falls_back_for_other_dims() {
+        let a = Point::new(vec![1.0, 0.0, 0.0]);
+        let b = Point::new(vec![1.0, 1.0, 0.0]);
+        assert!((Cosine768.proximity(&a, &b) - 0.7071).abs() < 1e-3);
+    }
+
     #[test]
     fn test_euclidean() {
         let a = Point::new(vec![0.0, 0.0]);
@@ -0,0 +1,482 @@
+//! # SIMD Kernels
+//!
+//! Hand-vectorized inner products for the proximity hot path.
+//!
+//! `dot_f32` picks the widest kernel the running CPU supports and falls
+//! back to a portable scalar loop everywhere else:
+//!
+//! - x86_64: AVX2 + FMA, detected at runtime (8 lanes per register)
+//! - aarch64: NEON, always available (4 lanes per register)
+//!
+//! Each kernel keeps four independent accumulators so consecutive FMAs do
+//! not wait on each other's results, then reduces them once at the end.
+//!
+//! `cosine_fixed` is the fixed-width counterpart for the common embedding
+//! sizes: the length is a const generic, so loop bounds are compile-time
+//! constants, and the dot product and both squared norms come out of a
+//! single pass over the inputs instead of three.
+//!
+//! `tile_dots_f32` scores one dimension-major tile (see `VectorBlocks`):
+//! each query component is broadcast against a contiguous run of lanes, so
+//! one pass over the tile yields a dot product per lane with no horizontal
+//! reductions. The AVX2 kernel is instantiated for 8 and 16 lanes.
+//!
+//! `dot_i8` is the int8 inner product behind quantized scans. With AVX2
+//! it multiplies 32 byte pairs per step (`maddubs` on `|a|` and `b` with
+//! `a`'s sign applied) and widens to i32 with `madd`.
+
+/// Dot product of two equal-length slices
+///
+/// # Example
+/// ```
+/// use arms_hat::core::simd::dot_f32;
+/// let dot = dot_f32(&[1.0, 2.0, 3.0], &[4.0, 5.0, 6.0]);
+/// assert!((dot - 32.0).abs() < 0.0001);
+/// ```
+pub fn dot_f32(a: &[f32], b: &[f32]) -> f32 {
+    assert_eq!(a.len(), b.len(), "Slices must have same length");
+
+    #[cfg(target_arch = "x86_64")]
+    {
+        if is_x86_feature_detected!("avx2") && is_x86_feature_detected!("fma") {
+            // SAFETY: the required CPU features were detected above
+            return unsafe { dot_avx2(a, b) };
+        }
+    }
+
+    #[cfg(target_arch = "aarch64")]
+    {
+        // SAFETY: NEON is part of the aarch64 baseline
+        return unsafe { dot_neon(a, b) };
+    }
+
+    #[allow(unreachable_code)]
+    dot_scalar(a, b)
+}
+
+/// Portable fallback
+fn dot_scalar(a: &[f32], b: &[f32]) -> f32 {
+    a.iter().zip(b.iter()).map(|(x, y)| x * y).sum()
+}
+
+#[cfg(target_arch = "x86_64")]
+#[target_feature(enable = "avx2,fma")]
+unsafe fn dot_avx2(a: &[f32], b: &[f32]) -> f32 {
+    use std::arch::x86_64::*;
+
+    let n = a.len();
+    let pa = a.as_ptr();
+    let pb = b.as_ptr();
+
+    let mut acc0 = _mm256_setzero_ps();
+    let mut acc1 = _mm256_setzero_ps();
+    let mut acc2 = _mm256_setzero_ps();
+    let mut acc3 = _mm256_setzero_ps();
+
+    let mut i = 0;
+    while i + 32 <= n {
+        acc0 = _mm256_fmadd_ps(_mm256_loadu_ps(pa.add(i)), _mm256_loadu_ps(pb.add(i)), acc0);
+        acc1 = _mm256_fmadd_ps(_mm256_loadu_ps(pa.add(i + 8)), _mm256_loadu_ps(pb.add(i + 8)), acc1);
+        acc2 = _mm256_fmadd_ps(_mm256_loadu_ps(pa.add(i + 16)), _mm256_loadu_ps(pb.add(i + 16)), acc2);
+        acc3 = _mm256_fmadd_ps(_mm256_loadu_ps(pa.add(i + 24)), _mm256_loadu_ps(pb.add(i + 24)), acc3);
+        i += 32;
+    }
+    while i + 8 <= n {
+        acc0 = _mm256_fmadd_ps(_mm256_loadu_ps(pa.add(i)), _mm256_loadu_ps(pb.add(i)), acc0);
+        i += 8;
+    }
+
+    // Horizontal sum: 4 accumulators -> 1 register -> 4 lanes -> 1 lane
+    let acc = _mm256_add_ps(_mm256_add_ps(acc0, acc1), _mm256_add_ps(acc2, acc3));
+    let quad = _mm_add_ps(_mm256_castps256_ps128(acc), _mm256_extractf128_ps(acc, 1));
+    let pair = _mm_add_ps(quad, _mm_movehl_ps(quad, quad));
+    let single = _mm_add_ss(pair, _mm_shuffle_ps(pair, pair, 0x55));
+    let mut sum = _mm_cvtss_f32(single);
+
+    while i < n {
+        sum += *pa.add(i) * *pb.add(i);
+        i += 1;
+    }
+
+    sum
+}
+
+#[cfg(target_arch = "aarch64")]
+unsafe fn dot_neon(a: &[f32], b: &[f32]) -> f32 {
+    use std::arch::aarch64::*;
+
+    let n = a.len();
+    let pa = a.as_ptr();
+    let pb = b.as_ptr();
+
+    let mut acc0 = vdupq_n_f32(0.0);
+    let mut acc1 = vdupq_n_f32(0.0);
+    let mut acc2 = vdupq_n_f32(0.0);
+    let mut acc3 = vdupq_n_f32(0.0);
+
+    let mut i = 0;
+    while i + 16 <= n {
+        acc0 = vfmaq_f32(acc0, vld1q_f32(pa.add(i)), vld1q_f32(pb.add(i)));
+        acc1 = vfmaq_f32(acc1, vld1q_f32(pa.add(i + 4)), vld1q_f32(pb.add(i + 4)));
+        acc2 = vfmaq_f32(acc2, vld1q_f32(pa.add(i + 8)), vld1q_f32(pb.add(i + 8)));
+        acc3 = vfmaq_f32(acc3, vld1q_f32(pa.add(i + 12)), vld1q_f32(pb.add(i + 12)));
+        i += 16;
+    }
+    while i + 4 <= n {
+        acc0 = vfmaq_f32(acc0, vld1q_f32(pa.add(i)), vld1q_f32(pb.add(i)));
+        i += 4;
+    }
+
+    let acc = vaddq_f32(vaddq_f32(acc0, acc1), vaddq_f32(acc2, acc3));
+    let mut sum = vaddvq_f32(acc);
+
+    while i < n {
+        sum += *pa.add(i) * *pb.add(i);
+        i += 1;
+    }
+
+    sum
+}
+
+/// Cosine similarity of two fixed-length vectors in one fused pass
+///
+/// Returns 0.0 if either vector has zero magnitude, like `Cosine`.
+///
+/// # Example
+/// ```
+/// use arms_hat::core::simd::cosine_fixed;
+/// let a = [1.0f32; 384];
+/// let b = [2.0f32; 384];
+/// assert!((cosine_fixed(&a, &b) - 1.0).abs() < 0.0001);
+/// ```
+pub fn cosine_fixed<const N: usize>(a: &[f32; N], b: &[f32; N]) -> f32 {
+    #[cfg(target_arch = "x86_64")]
+    {
+        if is_x86_feature_detected!("avx2") && is_x86_feature_detected!("fma") {
+            // SAFETY: the required CPU features were detected above
+            let (dot, aa, bb) = unsafe { cosine_parts_avx2(a, b) };
+            return finish_cosine(dot, aa, bb);
+        }
+    }
+
+    finish_cosine(dot_f32(a, b), dot_f32(a, a), dot_f32(b, b))
+}
+
+fn finish_cosine(dot: f32, aa: f32, bb: f32) -> f32 {
+    if aa == 0.0 || bb == 0.0 {
+        return 0.0;
+    }
+    dot / (aa.sqrt() * bb.sqrt())
+}
+
+/// Dot product and both squared norms in one pass over the inputs
+///
+/// Two accumulator sets (six registers) keep consecutive FMAs independent.
+/// `N` is a compile-time constant, so both loops have fixed trip counts.
+#[cfg(target_arch = "x86_64")]
+#[target_feature(enable = "avx2,fma")]
+unsafe fn cosine_parts_avx2<const N: usize>(a: &[f32; N], b: &[f32; N]) -> (f32, f32, f32) {
+    use std::arch::x86_64::*;
+
+    #[inline(always)]
+    unsafe fn hsum(v: __m256) -> f32 {
+        let quad = _mm_add_ps(_mm256_castps256_ps128(v), _mm256_extractf128_ps(v, 1));
+        let pair = _mm_add_ps(quad, _mm_movehl_ps(quad, quad));
+        _mm_cvtss_f32(_mm_add_ss(pair, _mm_shuffle_ps(pair, pair, 0x55)))
+    }
+
+    let pa = a.as_ptr();
+    let pb = b.as_ptr();
+
+    let mut dot0 = _mm256_setzero_ps();
+    let mut dot1 = _mm256_setzero_ps();
+    let mut aa0 = _mm256_setzero_ps();
+    let mut aa1 = _mm256_setzero_ps();
+    let mut bb0 = _mm256_setzero_ps();
+    let mut bb1 = _mm256_setzero_ps();
+
+    let body = N / 16 * 16;
+    let mut i = 0;
+    while i < body {
+        let x0 = _mm256_loadu_ps(pa.add(i));
+        let y0 = _mm256_loadu_ps(pb.add(i));
+        let x1 = _mm256_loadu_ps(pa.add(i + 8));
+        let y1 = _mm256_loadu_ps(pb.add(i + 8));
+        dot0 = _mm256_fmadd_ps(x0, y0, dot0);
+        dot1 = _mm256_fmadd_ps(x1, y1, dot1);
+        aa0 = _mm256_fmadd_ps(x0, x0, aa0);
+        aa1 = _mm256_fmadd_ps(x1, x1, aa1);
+        bb0 = _mm256_fmadd_ps(y0, y0, bb0);
+        bb1 = _mm256_fmadd_ps(y1, y1, bb1);
+        i += 16;
+    }
+
+    let mut dot = hsum(_mm256_add_ps(dot0, dot1));
+    let mut aa = hsum(_mm256_add_ps(aa0, aa1));
+    let mut bb = hsum(_mm256_add_ps(bb0, bb1));
+
+    while i < N {
+        let (x, y) = (*pa.add(i), *pb.add(i));
+        dot += x * y;
+        aa += x * x;
+        bb += y * y;
+        i += 1;
+    }
+
+    (dot, aa, bb)
+}
+
+/// Dot products of a query with every lane of one dimension-major tile
+///
+/// Lane `l` of dimension `d` lives at `tile[d * out.len() + l]`; `out`
+/// receives one dot product per lane.
+///
+/// # Example
+/// ```
+/// use arms_hat::core::simd::tile_dots_f32;
+/// // Two lanes: v0 = [1, 2], v1 = [3, 4]
+/// let mut out = [0.0f32; 2];
+/// tile_dots_f32(&[1.0, 1.0], &[1.0, 3.0, 2.0, 4.0], &mut out);
+/// assert_eq!(out, [3.0, 7.0]);
+/// ```
+pub fn tile_dots_f32(query: &[f32], tile: &[f32], out: &mut [f32]) {
+    assert_eq!(tile.len(), query.len() * out.len(), "Tile must hold one lane run per dimension");
+
+    #[cfg(target_arch = "x86_64")]
+    {
+        if is_x86_feature_detected!("avx2") && is_x86_feature_detected!("fma") {
+            // SAFETY: the required CPU features were detected above, and
+            // the tile length was checked against the lane count
+            match out.len() {
+                16 => return unsafe { tile_dots_avx2::<2>(query, tile, out) },
+                8 => return unsafe { tile_dots_avx2::<1>(query, tile, out) },
+                _ => {}
+            }
+        }
+    }
+
+    tile_dots_scalar(query, tile, out)
+}
+
+/// Portable fallback
+fn tile_dots_scalar(query: &[f32], tile: &[f32], out: &mut [f32]) {
+    out.fill(0.0);
+    for (&q, lanes) in query.iter().zip(tile.chunks_exact(out.len())) {
+        for (acc, &x) in out.iter_mut().zip(lanes) {
+            *acc += q * x;
+        }
+    }
+}
+
+/// Tile kernel for `8 * G` lanes
+///
+/// Four dimensions are processed per step, each into its own accumulator
+/// set, so consecutive FMAs into one register are four steps apart.
+#[cfg(target_arch = "x86_64")]
+#[target_feature(enable = "avx2,fma")]
+unsafe fn tile_dots_avx2<const G: usize>(query: &[f32], tile: &[f32], out: &mut [f32]) {
+    use std::arch::x86_64::*;
+
+    let lanes = G * 8;
+    let n = query.len();
+    let pq = query.as_ptr();
+    let pt = tile.as_ptr();
+
+    let mut acc = [[_mm256_setzero_ps(); G]; 4];
+
+    let mut d = 0;
+    while d + 4 <= n {
+        for (u, acc) in acc.iter_mut().enumerate() {
+            let q = _mm256_set1_ps(*pq.add(d + u));
+            let row = pt.add((d + u) * lanes);
+            for (g, acc) in acc.iter_mut().enumerate() {
+                *acc = _mm256_fmadd_ps(q, _mm256_loadu_ps(row.add(g * 8)), *acc);
+            }
+        }
+        d += 4;
+    }
+    while d < n {
+        let q = _mm256_set1_ps(*pq.add(d));
+        let row = pt.add(d * lanes);
+        for (g, acc) in acc[0].iter_mut().enumerate() {
+            *acc = _mm256_fmadd_ps(q, _mm256_loadu_ps(row.add(g * 8)), *acc);
+        }
+        d += 1;
+    }
+
+    let po = out.as_mut_ptr();
+    for g in 0..G {
+        let sum = _mm256_add_ps(
+            _mm256_add_ps(acc[0][g], acc[1][g]),
+            _mm256_add_ps(acc[2][g], acc[3][g]),
+        );
+        _mm256_storeu_ps(po.add(g * 8), sum);
+    }
+}
+
+/// Dot product of two equal-length int8 slices, accumulated in i32
+///
+/// Codes must lie in `-127..=127` (as produced by symmetric quantization);
+/// `-128` can saturate the AVX2 kernel's 16-bit pair sums.
+///
+/// # Example
+/// ```
+/// use arms_hat::core::simd::dot_i8;
+/// assert_eq!(dot_i8(&[1, -2, 3], &[4, 5, -6]), -24);
+/// ```
+pub fn dot_i8(a: &[i8], b: &[i8]) -> i32 {
+    assert_eq!(a.len(), b.len(), "Slices must have same length");
+
+    #[cfg(target_arch = "x86_64")]
+    {
+        if is_x86_feature_detected!("avx2") {
+            // SAFETY: the required CPU feature was detected above
+            return unsafe { dot_i8_avx2(a, b) };
+        }
+    }
+
+    dot_i8_scalar(a, b)
+}
+
+/// Portable fallback
+fn dot_i8_scalar(a: &[i8], b: &[i8]) -> i32 {
+    a.iter().zip(b.iter()).map(|(&x, &y)| x as i32 * y as i32).sum()
+}
+
+#[cfg(target_arch = "x86_64")]
+#[target_feature(enable = "avx2")]
+unsafe fn dot_i8_avx2(a: &[i8], b: &[i8]) -> i32 {
+    use std::arch::x86_64::*;
+
+    #[inline(always)]
+    unsafe fn step(pa: *const i8, pb: *const i8, ones: __m256i, acc: __m256i) -> __m256i {
+        let x = _mm256_loadu_si256(pa as *const __m256i);
+        let y = _mm256_loadu_si256(pb as *const __m256i);
+        // maddubs takes one unsigned operand: move a's sign onto b
+        let pairs = _mm256_maddubs_epi16(_mm256_abs_epi8(x), _mm256_sign_epi8(y, x));
+        _mm256_add_epi32(acc, _mm256_madd_epi16(pairs, ones))
+    }
+
+    let n = a.len();
+    let pa = a.as_ptr();
+    let pb = b.as_ptr();
+    let ones = _mm256_set1_epi16(1);
+
+    let mut acc0 = _mm256_setzero_si256();
+    let mut acc1 = _mm256_setzero_si256();
+
+    let mut i = 0;
+    while i + 64 <= n {
+        acc0 = step(pa.add(i), pb.add(i), ones, acc0);
+        acc1 = step(pa.add(i + 32), pb.add(i + 32), ones, acc1);
+        i += 64;
+    }
+    while i + 32 <= n {
+        acc0 = step(pa.add(i), pb.add(i), ones, acc0);
+        i += 32;
+    }
+
+    let acc = _mm256_add_epi32(acc0, acc1);
+    let quad = _mm_add_epi32(_mm256_castsi256_si128(acc), _mm256_extracti128_si256(acc, 1));
+    let pair = _mm_add_epi32(quad, _mm_unpackhi_epi64(quad, quad));
+    let single = _mm_add_epi32(pair, _mm_shuffle_epi32(pair, 0x55));
+    let mut sum = _mm_cvtsi128_si32(single);
+
+    while i < n {
+        sum += *pa.add(i) as i32 * *pb.add(i) as i32;
+        i += 1;
+    }
+
+    sum
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_dot_matches_scalar_all_tails() {
+        // Lengths cover the unrolled body, the single-register loop and the tail
+        for n in 0..80 {
+            let a: Vec<f32> = (0..n).map(|i| (i as f32 * 0.31).sin()).collect();
+            let b: Vec<f32> = (0..n).map(|i| (i as f32 * 0.17).cos()).collect();
+            let expected = dot_scalar(&a, &b);
+            assert!((dot_f32(&a, &b) - expected).abs() < 1e-4, "length {}", n);
+        }
+    }
+
+    #[test]
+    fn test_dot_high_dimensions() {
+        let a = vec![0.5f32; 1536];
+        let b = vec![2.0f32; 1536];
+        assert!((dot_f32(&a, &b) - 1536.0).abs() < 0.01);
+    }
+
+    #[test]
+    fn test_cosine_fixed_matches_slices() {
+        fn check<const N: usize>() {
+            let a: [f32; N] = std::array::from_fn(|i| (i as f32 * 0.31).sin());
+            let b: [f32; N] = std::array::from_fn(|i| (i as f32 * 0.17).cos());
+            let expected = dot_scalar(&a, &b)
+                / (dot_scalar(&a, &a).sqrt() * dot_scalar(&b, &b).sqrt());
+            assert!((cosine_fixed(&a, &b) - expected).abs() < 1e-5, "length {}", N);
+        }
+
+        check::<384>();
+        check::<768>();
+        check::<1536>();
+        check::<7>(); // shorter than one lane group: tail only
+    }
+
+    #[test]
+    fn test_cosine_fixed_zero_vector() {
+        assert_eq!(cosine_fixed(&[0.0f32; 384], &[1.0f32; 384]), 0.0);
+    }
+
+    #[test]
+    fn test_tile_dots_match_rows() {
+        // 8 and 16 lanes take the AVX2 kernel where available, 5 the fallback;
+        // 7 dimensions leave a remainder after the four-dimension steps
+        for lanes in [5, 8, 16] {
+            for dims in [1, 7, 384] {
+                let rows: Vec<Vec<f32>> = (0..lanes)
+                    .map(|l| (0..dims).map(|d| ((l * dims + d) as f32 * 0.13).sin()).collect())
+                    .collect();
+                let query: Vec<f32> = (0..dims).map(|d| (d as f32 * 0.29).cos()).collect();
+
+                let mut tile = vec![0.0f32; dims * lanes];
+                for (l, row) in rows.iter().enumerate() {
+                    for (d, &x) in row.iter().enumerate() {
+                        tile[d * lanes + l] = x;
+                    }
+                }
+
+                let mut out = vec![0.0f32; lanes];
+                tile_dots_f32(&query, &tile, &mut out);
+                for (l, row) in rows.iter().enumerate() {
+                    let expected = dot_scalar(&query, row);
+                    assert!((out[l] - expected).abs() < 1e-3, "lanes {} dims {}", lanes, dims);
+                }
+            }
+        }
+    }
+
+    #[test]
+    fn test_dot_i8_matches_scalar_all_tails() {
+        // Lengths cover both unrolled loops and the tail; codes span -127..=127
+        for n in 0..140 {
+            let a: Vec<i8> = (0..n).map(|i| ((i * 37) % 255) as i32 - 127).map(|x| x as i8).collect();
+            let b: Vec<i8> = (0..n).map(|i| 127 - ((i * 53) % 255) as i32).map(|x| x as i8).collect();
+            assert_eq!(dot_i8(&a, &b), dot_i8_scalar(&a, &b), "length {}", n);
+        }
+
+        // Extreme codes must not saturate
+        assert_eq!(dot_i8(&[127; 64], &[-127; 64]), -127 * 127 * 64);
+    }
+
+    #[test]
+    #[should_panic(expected = "same length")]
+    fn test_dot_length_mismatch_panics() {
+        dot_f32(&[1.0, 2.0], &[1.0]);
+    }
+}